@@ -3,9 +3,16 @@ and is meant to be run directly to start the bot.
 """
 import sys
 import asyncio
+from datetime import timedelta
+from typing import Coroutine
 from os import getenv
 
-from discord import Interaction, Intents, app_commands, Message, Embed, DeletedReferencedMessage
+try:
+    import uvloop  # faster event loop (not available on Windows)
+except ImportError:
+    uvloop = None
+
+from discord import Interaction, Intents, app_commands, Message, Embed, DeletedReferencedMessage, User, utils
 from discord.ext import commands
 from discord.ext.commands import Context
 
@@ -14,24 +21,115 @@ from cogs.persist_commands import PersistentView
 
 
 bot_token = getenv("DISCORD_BOT_TOKEN")
-intents = Intents.default()
-intents.typing = False
-intents.members = True
+# only enable what the cogs use, so discord doesn't send (and we don't parse/cache) anything else
+intents = Intents.none()
+intents.guilds = True
+intents.members = True  # role.members
+intents.guild_messages = True  # on_message
+intents.dm_messages = True  # trivia answers
 intents.message_content = True
+intents.guild_scheduled_events = True  # keeps guild.scheduled_events up to date
 
 bot = commands.Bot(command_prefix='!',
                    intents=intents, help_command=None)
 
+unexpected_error_message = "An unexpected error occurred. Please notify Bizzy."
+
+# the text commands that are handled in on_message
+prefix_commands = tuple(f"{bot.command_prefix}{c}" for c in ("kill", "reload"))
+
 if not bot_token:
     raise ValueError(
         "DISCORD_BOT_TOKEN is not set in the environment variables")
 
+# queues of messages waiting to be bulk deleted, keyed by channel id
+delete_queues: dict[int, asyncio.Queue] = {}
+delete_workers: dict[int, asyncio.Task] = {}
+
+# limit how many messages are processed (emojified) at once without blocking the next message
+message_semaphore = asyncio.Semaphore(int(getenv("MAX_CONCURRENT_MESSAGES", "4")))
+
+# references to fire-and-forget tasks so they aren't garbage collected before they finish
+background_tasks: set[asyncio.Task] = set()
+
 
 async def setup_hook() -> None:
     """Re-links/syncs the bot's persistent buttons"""
     bot.add_view(PersistentView())
 
-    sys.stderr = open(f'./logs/{global_utils.log_date}_stderr.log', 'a', encoding="utf-8")
+    for channel_id in [global_utils.bot_channel_id]:
+        delete_queues[channel_id] = asyncio.Queue()
+        delete_workers[channel_id] = asyncio.create_task(bulk_delete_worker(delete_queues[channel_id]))
+
+
+async def get_bizzy() -> User:
+    """[helper] Gets Bizzy's user object from the cache, only fetching it from Discord if it isn't cached
+
+    Returns
+    -------
+    discord.User
+        Bizzy's user object
+    """
+    return bot.get_user(global_utils.my_id) or await bot.fetch_user(global_utils.my_id)
+
+
+async def notify_bizzy(message: str) -> None:
+    """[helper] DMs Bizzy a message
+
+    Parameters
+    ----------
+    message : str
+        The message to send
+    """
+    bizzy = await get_bizzy()
+    await bizzy.send(message)
+
+
+def run_in_background(coro: Coroutine) -> asyncio.Task:
+    """[helper] Runs a coroutine in a background task so the caller doesn't have to wait for it
+
+    Parameters
+    ----------
+    coro : Coroutine
+        The coroutine to run
+
+    Returns
+    -------
+    asyncio.Task
+        The task running the coroutine
+    """
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_task_done)
+    return task
+
+
+async def delete_later(message: Message, delay: float) -> None:
+    """[helper] Deletes a message after a delay. Use with run_in_background so errors are logged
+
+    Parameters
+    ----------
+    message : discord.Message
+        The message to delete
+    delay : float
+        The number of seconds to wait before deleting the message
+    """
+    await asyncio.sleep(delay)
+    await message.delete()
+
+
+def background_task_done(task: asyncio.Task) -> None:
+    """[helper] Cleans up a finished background task and logs any error it raised
+
+    Parameters
+    ----------
+    task : asyncio.Task
+        The finished task
+    """
+    background_tasks.discard(task)
+
+    if not task.cancelled() and task.exception() is not None:
+        global_utils.debug_log(f"Error in background task: {task.exception()}")
 
 
 @bot.tree.error
@@ -62,13 +160,11 @@ async def on_app_command_error(interaction: Interaction, error: app_commands.App
     if interaction.user.id == global_utils.my_id:
         await interaction.response.send_message(f"{error}", ephemeral=True)
     else:
-        err = "An unexpected error occurred. Please notify Bizzy."
-        m = await interaction.response.send_message(err, ephemeral=True)
-        await m.delete(delay=5)
+        await interaction.response.send_message(unexpected_error_message,
+                                                ephemeral=True, delete_after=global_utils.delete_after_seconds)
 
-        bizzy = await bot.fetch_user(global_utils.my_id)
         user_name = interaction.user.name
-        await bizzy.send(f"Error in slash command by {user_name}: {error}")
+        run_in_background(notify_bizzy(f"Error in slash command by {user_name}: {error}"))
 
 
 @bot.event
@@ -87,13 +183,43 @@ async def on_command_error(ctx: Context, error: commands.CommandError) -> None:
     if ctx.author.id == global_utils.my_id:
         await ctx.send(f"{error}")
     else:
-        m = await ctx.send("An unexpected error occurred. Please notify Bizzy.")
-        await m.delete(delay=5)
-        await ctx.message.delete(delay=5)
+        await ctx.send(unexpected_error_message, delete_after=global_utils.delete_after_seconds)
+        run_in_background(delete_later(ctx.message, global_utils.delete_after_seconds))
 
-        bizzy = await bot.fetch_user(global_utils.my_id)
         user_name = ctx.author.name
-        await bizzy.send(f"Error in text command by {user_name}: {error}")
+        run_in_background(notify_bizzy(f"Error in text command by {user_name}: {error}"))
+
+
+async def bulk_delete_worker(queue: asyncio.Queue) -> None:
+    """[helper] Drains a channel's delete queue, deleting the queued messages in batches
+    (bulk deletion is 1 request for up to 100 messages instead of 1 request per message)
+
+    Parameters
+    ----------
+    queue : asyncio.Queue
+        The queue of messages (all from the same channel) to delete
+    """
+    while True:
+        batch = [await queue.get()]
+        await asyncio.sleep(1)  # wait a moment for any other messages in the burst
+
+        while not queue.empty() and len(batch) < 100:
+            batch.append(queue.get_nowait())
+
+        # bulk deletion only works for messages up to 14 days old
+        cutoff = utils.utcnow() - timedelta(days=14)
+        recent = [m for m in batch if m.created_at > cutoff]
+        old = [m for m in batch if m.created_at <= cutoff]
+
+        try:
+            if recent:
+                await batch[0].channel.delete_messages(recent)
+
+            for m in old:
+                await m.delete()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # keep the worker alive, otherwise this channel's messages would never be deleted again
+            global_utils.debug_log(f"Failed to bulk delete messages: {e}")
 
 
 async def process_message(message: Message) -> None:
@@ -110,6 +236,18 @@ async def process_message(message: Message) -> None:
         await send_emojified(message, emoji_dict)
 
 
+async def handle_message(message: Message) -> None:
+    """[helper] Processes a message once there is room in the message semaphore
+
+    Parameters
+    ----------
+    message : discord.Message
+        The message object to process
+    """
+    async with message_semaphore:
+        await process_message(message)
+
+
 async def send_emojified(message: Message, emoji_dict: dict) -> None:
     """[helper] Sends a message for a user by proxy.
     This is mainly used for emojifying messages.
@@ -128,15 +266,16 @@ async def send_emojified(message: Message, emoji_dict: dict) -> None:
 
     if len(emoji_dict["emojis"]) == 1:
         emoji = emoji_dict["emojis"][0]
-        emoji = global_utils.custom_emojis[emoji]
         # if the message is just the emoji, make it an image and not a description
-        if description == emoji["format"]:
+        if description == global_utils.emoji_formats[emoji]:
             description = None
-            image_url = emoji["link"]
+            image_url = global_utils.emoji_links[emoji]
 
     embed = (Embed(description=description, color=message.author.color)
-             .set_author(name=author["name"], icon_url=author["icon_url"])
-             .set_image(url=image_url))
+             .set_author(name=author["name"], icon_url=author["icon_url"]))
+
+    if image_url is not None:
+        embed.set_image(url=image_url)
 
     if message.reference:
         global_utils.debug_log("Replying to")
@@ -162,38 +301,49 @@ async def on_message(message: Message) -> None:
     if message.author == bot.user:
         return
 
-    if (message.content.startswith(f"{bot.command_prefix}kill")
-            or message.content.startswith(f"{bot.command_prefix}reload")):
+    if message.content.startswith(prefix_commands):
         await bot.process_commands(message)
 
     # This channel is used for the persistent view and should not have any other messages
     # (unless they are from the bot or are slash commands)
     if message.channel.id == global_utils.bot_channel_id:
-        await message.delete()
+        delete_queues[message.channel.id].put_nowait(message)
+        return
+
+    # cheap checks so that most messages never reach the emojifier
+    if message.guild is None or message.guild.id not in global_utils.emojify_guild_ids or ";" not in message.content:
         return
 
-    await process_message(message)
+    # don't hold up the next message while this one is being processed
+    run_in_background(handle_message(message))
 
 
-async def get_teammate_ids():
+async def get_teammate_ids() -> frozenset[int]:
     """Gets the IDs of all teammates in the val server
     """
     val_server = bot.get_guild(global_utils.val_server_id)
     val_role = val_server.get_role(global_utils.val_role_id)
-    return [member.id for member in val_role.members]
+    return frozenset(member.id for member in val_role.members)
 
 
 async def main() -> None:
     """[main] Loads all cogs and starts the bot
     """
-    sys.stdout = open(global_utils.log_filepath, 'a', encoding="utf-8")
+    global_utils.log_listener.start()
     bot.setup_hook = setup_hook
-    await global_utils.load_cogs(bot)
-    await bot.start(bot_token)
 
-    global_utils.teammate_ids = await get_teammate_ids()
+    try:
+        await global_utils.load_cogs(bot)
+        await bot.start(bot_token)
+
+        global_utils.teammate_ids = await get_teammate_ids()
+    finally:
+        global_utils.log_listener.stop()  # flushes any queued logs
 
 if __name__ == '__main__':
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     try:
         # bot.run(bot_token)
         asyncio.run(main())
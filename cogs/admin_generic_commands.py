@@ -143,6 +143,29 @@ class AdminGenericCommands(commands.Cog):
     #     global_utils.reminders[dt_when].remove((g.id, message))
     #     global_utils.save_reminders()
 
+    async def convert_message_id(self, interaction: discord.Interaction, message_id: str) -> int | None:
+        """Converts a message ID input to an integer and
+        sends an error message via interaction.response if the ID is invalid
+
+        Parameters
+        ----------
+        interaction : discord.Interaction
+            The interaction object that initiated the command
+        message_id : str
+            The message ID to convert
+
+        Returns
+        -------
+        int | None
+            The converted message ID if valid, otherwise None
+        """
+        try:
+            return int(message_id)
+        except ValueError:
+            await interaction.response.send_message('Invalid message ID.',
+                                                    ephemeral=True, delete_after=global_utils.delete_after_seconds)
+            return None
+
     @app_commands.command(name="pin", description=global_utils.commands["pin"]["description"])
     @app_commands.describe(
         message_id="The ID of the message to pin"
@@ -157,8 +180,12 @@ class AdminGenericCommands(commands.Cog):
         message_id : str
             The ID of the message to pin
         """
+        m_id = await self.convert_message_id(interaction, message_id)
+        if m_id is None:
+            return  # error message already sent
+
         try:
-            message = interaction.channel.get_partial_message(int(message_id))
+            message = interaction.channel.get_partial_message(m_id)
             await message.pin()
         except (discord.HTTPException, discord.errors.NotFound):
             await interaction.response.send_message('Message not found.',
@@ -185,8 +212,12 @@ class AdminGenericCommands(commands.Cog):
         message_id : str
             The ID of the message to unpin
         """
+        m_id = await self.convert_message_id(interaction, message_id)
+        if m_id is None:
+            return  # error message already sent
+
         try:
-            message = interaction.channel.get_partial_message(int(message_id))
+            message = interaction.channel.get_partial_message(m_id)
             await message.unpin()
         except (discord.HTTPException, discord.errors.NotFound):
             await interaction.response.send_message('Message not found.',
@@ -213,9 +244,14 @@ class AdminGenericCommands(commands.Cog):
         message_id : str
             The ID of the message to delete
         """
+        m_id = await self.convert_message_id(interaction, message_id)
+        if m_id is None:
+            return  # error message already sent
+
         try:
-            await interaction.channel.get_partial_message(int(message_id)).delete()
-        except (ValueError, discord.errors.NotFound):
+            message = interaction.channel.get_partial_message(m_id)
+            await message.delete()
+        except (discord.HTTPException, discord.errors.NotFound):
             await interaction.response.send_message('Message not found.',
                                                     ephemeral=True, delete_after=global_utils.delete_after_seconds)
             return
@@ -1,7 +1,11 @@
 """[cog] A cog for managing premier events, practices, and map pool
 """
+import asyncio
+import sqlite3
+from functools import lru_cache, wraps
+from itertools import islice
+from typing import Callable
 from datetime import datetime, time, timedelta
-from re import match
 from pytz import utc
 import asqlite
 
@@ -14,6 +18,12 @@ from global_utils import global_utils
 # pylint: disable=invalid-overridden-method
 # pylint: disable=arguments-differ
 
+# ALTER TABLE ... DROP COLUMN was added in SQLite 3.35. Older versions have to rebuild the table instead
+sqlite_drop_column = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# shown when a map isn't in the pool (styled once instead of on every command)
+map_pool_hint = f"Ensure that {global_utils.style_text('/map-pool', 'c')} is updated."
+
 
 def owner_excluded_cooldown(interaction: discord.Interaction) -> app_commands.Cooldown | None:
     """A custom cooldown decorator that excludes the bot owner from the cooldown
@@ -34,6 +44,144 @@ def owner_excluded_cooldown(interaction: discord.Interaction) -> app_commands.Co
     return app_commands.Cooldown(1, 60)
 
 
+@lru_cache(maxsize=128)
+def style_map_name(map_name: str) -> str:
+    """Formats a map name for display in Discord (cached, since the set of map names is small)
+
+    Parameters
+    ----------
+    map_name : str
+        The (lowercase) map name to format
+
+    Returns
+    -------
+    str
+        The title-cased, italicized map name
+    """
+    return global_utils.style_text(map_name.title(), 'i')
+
+
+def discord_retry(max_tries: int = 3) -> Callable:
+    """A decorator that retries a Discord API call when it gets rate limited (429),
+    waiting for the server's retry_after (or an exponential backoff) between tries
+
+    Parameters
+    ----------
+    max_tries : int, optional
+        The maximum number of times to try the call, by default 3
+
+    Returns
+    -------
+    Callable
+        The decorator to apply to an async function
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            delay = 1
+            for attempt in range(max_tries):
+                try:
+                    return await func(*args, **kwargs)
+                except discord.HTTPException as e:
+                    if e.status != 429 or attempt == max_tries - 1:
+                        raise
+
+                    await asyncio.sleep(max(getattr(e, "retry_after", 0), delay))
+                    delay = min(delay * 2, 30)
+
+        return wrapper
+
+    return decorator
+
+
+def map_choices(map_names: list[str], current: str) -> list[app_commands.Choice[str]]:
+    """Builds the autocomplete choices for a map name option from the maps that match what the user has typed
+
+    Parameters
+    ----------
+    map_names : list[str]
+        The (lowercase) map names to choose from
+    current : str
+        What the user has typed so far
+
+    Returns
+    -------
+    list[app_commands.Choice[str]]
+        The matching choices (Discord shows at most 25)
+    """
+    current = current.lower()
+    return [app_commands.Choice(name=m.title(), value=m) for m in map_names if current in m][:25]
+
+
+async def all_maps_autocomplete(interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:  # pylint: disable=unused-argument
+    """[autocomplete] Suggests any map in the game"""
+    return map_choices(list(global_utils.map_preferences), current)
+
+
+async def pool_maps_autocomplete(interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:  # pylint: disable=unused-argument
+    """[autocomplete] Suggests the maps in the map pool"""
+    return map_choices(global_utils.map_pool, current)
+
+
+async def event_maps_autocomplete(interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:  # pylint: disable=unused-argument
+    """[autocomplete] Suggests the maps in the map pool and playoffs"""
+    return map_choices(global_utils.map_pool + ["playoffs"], current)
+
+
+@discord_retry()
+async def end_event(event: discord.ScheduledEvent) -> None:
+    """Removes an event from the schedule: cancels it if it is scheduled, ends it if it is active,
+    and otherwise deletes it
+
+    Parameters
+    ----------
+    event : discord.ScheduledEvent
+        The event to remove
+    """
+    if event.status == discord.EventStatus.scheduled:
+        await event.cancel()
+    elif event.status == discord.EventStatus.active:
+        await event.end()
+    else:
+        await event.delete()
+
+
+class RateLimiter:
+    """A token bucket rate limiter. Allows bursts of up to `rate` calls, then 1 call every `per / rate` seconds
+
+    Parameters
+    ----------
+    rate : int
+        The number of calls allowed per period
+    per : float
+        The length of the period in seconds
+    """
+
+    def __init__(self, rate: int, per: float) -> None:
+        self.rate = rate
+        self.per = per
+        self.tokens = float(rate)
+        self.last_refill = asyncio.get_running_loop().time()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Waits until a call is allowed and then uses up a token
+        """
+        loop = asyncio.get_running_loop()
+
+        async with self.lock:
+            while True:
+                now = loop.time()
+                self.tokens = min(self.rate, self.tokens + (now - self.last_refill) * self.rate / self.per)
+                self.last_refill = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) * self.per / self.rate)
+
+
 class AdminPremierCommands(commands.Cog):
     """[cog] A cog for managing the premier events and practices`
 
@@ -47,6 +195,37 @@ class AdminPremierCommands(commands.Cog):
         self.bot = bot
         self.debug_event_channel_id = 1217649405759324236  # debug voice channel
         self.event_channel_id = 1100632843174031476  # premier voice channel
+        # practices are the Wednesday and Friday around each Thursday premier event (EST)
+        self.wed_practice_time = time(hour=22)
+        self.fri_practice_time = time(hour=23)
+
+        # THERE IS A RATELIMIT OF 5 EVENTS/MINUTE (per guild)
+        self.event_rate_limiters: dict[int, RateLimiter] = {}
+        self.max_concurrent_requests = 5
+
+        # map changes are synced to discord after a short delay so several changes in a row only sync once
+        self.sync_delay = 5
+        self.sync_task: asyncio.Task | None = None
+        self.running_sync: asyncio.Task | None = None  # the sync that has started (and can't be cancelled)
+
+        # one connection to the maps database for the cog's lifetime (opened in cog_load).
+        # the lock keeps one command's transaction from interleaving with another's
+        self.db: asqlite.Connection | None = None
+        self.db_lock = asyncio.Lock()
+
+    async def cog_load(self) -> None:
+        """[event] Opens the cog's database connection when the cog is loaded
+        """
+        self.db = await asqlite.connect("./local_storage/maps.db")
+        await global_utils.tune_db_connection(self.db)
+
+    async def cog_unload(self) -> None:
+        """[event] Closes the cog's database connection when the cog is unloaded
+        """
+        # wait for any command still using the connection
+        async with self.db_lock:
+            if self.db is not None:
+                await self.db.close()
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         """[app check] A global check for all app commands in this cog to ensure the user is an admin
@@ -63,6 +242,73 @@ class AdminPremierCommands(commands.Cog):
         """
         return await global_utils.is_admin(interaction)
 
+    async def create_events(self, guild: discord.Guild, events: list[dict]) -> int:
+        """Creates scheduled events concurrently while staying under the event creation rate limit.
+        A failed event does not stop the others, it is logged and counted instead
+
+        Parameters
+        ----------
+        guild : discord.Guild
+            The guild to create the events in
+        events : list[dict]
+            The keyword arguments for each guild.create_scheduled_event call
+
+        Returns
+        -------
+        int
+            The number of events that could not be created
+        """
+        if guild.id not in self.event_rate_limiters:
+            self.event_rate_limiters[guild.id] = RateLimiter(5, 60)
+
+        rate_limiter = self.event_rate_limiters[guild.id]
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+
+        @discord_retry()
+        async def create(event: dict) -> None:
+            await rate_limiter.acquire()
+            await guild.create_scheduled_event(**event)
+
+        async def limited_create(event: dict) -> None:
+            async with semaphore:
+                await create(event)
+
+        results = await asyncio.gather(*(limited_create(e) for e in events), return_exceptions=True)
+
+        failed = [(e, r) for e, r in zip(events, results) if isinstance(r, Exception)]
+        for event, error in failed:
+            global_utils.debug_log(f"Failed to create event {event['name']} on {event['start_time']}: {error}")
+
+        return len(failed)
+
+    async def end_events(self, events: list[discord.ScheduledEvent]) -> int:
+        """Removes multiple events from the schedule concurrently.
+        A failed event does not stop the others, it is logged and counted instead
+
+        Parameters
+        ----------
+        events : list[discord.ScheduledEvent]
+            The events to remove
+
+        Returns
+        -------
+        int
+            The number of events that could not be removed
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+
+        async def limited_end(event: discord.ScheduledEvent) -> None:
+            async with semaphore:
+                await end_event(event)
+
+        results = await asyncio.gather(*(limited_end(e) for e in events), return_exceptions=True)
+
+        failed = [(e, r) for e, r in zip(events, results) if isinstance(r, Exception)]
+        for event, error in failed:
+            global_utils.debug_log(f"Failed to remove event {event.name} on {event.start_time}: {error}")
+
+        return len(failed)
+
     @app_commands.command(name="map-pool", description=global_utils.commands["map-pool"]["description"])
     # since this command syncs the bot entirely, we need to limit it
     @app_commands.checks.dynamic_cooldown(owner_excluded_cooldown)
@@ -76,22 +322,51 @@ class AdminPremierCommands(commands.Cog):
         """
         await interaction.response.defer(ephemeral=True)
 
-        view = MapPoolPanel(sync_changes=self.sync_map_pool)
+        view = MapPoolPanel(sync_changes=self.request_sync)
 
         await interaction.followup.send("Map Pool (make sure you click out of the dropdown before hitting a button)",
                                         view=view, ephemeral=True)
 
     async def sync_map_pool(self) -> None:
         """Reflects the changes made to the map pool in relevant command options
+        """
+        await global_utils.load_cogs(self.bot)
+        await asyncio.gather(self.bot.tree.sync(guild=Object(id=global_utils.val_server_id)),
+                             self.bot.tree.sync(guild=Object(id=global_utils.debug_server_id)))
+
+    def request_sync(self) -> None:
+        """[helper] Schedules a sync of the map changes, replacing any sync that hasn't started yet.
+        Use !reload with sync to force an immediate sync
+        """
+        if self.sync_task is not None and not self.sync_task.done():
+            self.sync_task.cancel()
+
+        self.sync_task = asyncio.create_task(self.deferred_sync())
+
+    async def deferred_sync(self) -> None:
+        """[helper] Waits for any more map changes and then syncs them
+        """
+        await asyncio.sleep(self.sync_delay)
+
+        self.running_sync = asyncio.create_task(self.sync_map_pool())
+        self.running_sync.add_done_callback(self.sync_done)
+
+        # once started, a newer request must not cancel the sync halfway through reloading the cogs
+        try:
+            await asyncio.shield(self.running_sync)
+        except Exception:  # pylint: disable=broad-exception-caught
+            pass  # already reported by sync_done
+
+    def sync_done(self, task: asyncio.Task) -> None:
+        """[helper] Reports any error from a background map sync, since there is no interaction to report it to
 
         Parameters
         ----------
-        guild_id : int
-            The guild ID to sync the map pool in
+        task : asyncio.Task
+            The finished sync task
         """
-        await global_utils.load_cogs(self.bot)
-        await self.bot.tree.sync(guild=Object(id=global_utils.val_server_id))
-        await self.bot.tree.sync(guild=Object(id=global_utils.debug_server_id))
+        if not task.cancelled() and task.exception() is not None:
+            global_utils.debug_log(f"Failed to sync the map changes: {task.exception()}")
 
     @app_commands.command(name="add-map", description=global_utils.commands["add-map"]["description"])
     @app_commands.describe(
@@ -110,41 +385,42 @@ class AdminPremierCommands(commands.Cog):
         """
         # await interaction.response.defer(ephemeral=True)
         map_name = map_name.lower()
-        map_display_name = global_utils.style_text(map_name.title(), 'i')
+        map_display_name = style_map_name(map_name)
 
         if map_name in global_utils.map_preferences:
             await interaction.response.send_message(f'Map "{map_display_name}" is already in the game.',
                                                     ephemeral=True, delete_after=global_utils.delete_after_seconds)
             return
 
-        async with asqlite.connect("./local_storage/maps.db") as conn:
-            async with conn.cursor() as cursor:
+        async with self.db_lock:
+            async with self.db.cursor() as cursor:
                 await cursor.execute("BEGIN TRANSACTION")
-                await cursor.execute("INSERT INTO info VALUES (?, ?, ?, ?)", (map_name, 0, 0, url))
-                await cursor.execute(f"ALTER TABLE preferences ADD COLUMN {map_name} integer default NULL")
-            await conn.commit()
-
-        global_utils.map_preferences = {
-            map_name: {}} | global_utils.map_preferences
-        global_utils.map_weights = {map_name: 0} | global_utils.map_weights
+                try:
+                    await cursor.execute("INSERT INTO info VALUES (?, ?, ?, ?)", (map_name, 0, 0, url))
+                    await cursor.execute(
+                        f"ALTER TABLE preferences ADD COLUMN {global_utils.quote_identifier(map_name)} integer default NULL")
+                except Exception:
+                    # don't leave the shared connection inside a half finished transaction
+                    await self.db.rollback()
+                    raise
+            await self.db.commit()
+
+        global_utils.map_preferences[map_name] = {}
+        global_utils.map_weights[map_name] = 0
         global_utils.map_weights = {k: v for k, v in sorted(
             global_utils.map_weights.items(), key=lambda item: item[1], reverse=True)}
         global_utils.map_image_urls[map_name] = url
 
-        await interaction.response.defer(thinking=True, ephemeral=True)
-        await self.sync_map_pool()
-        m = await interaction.followup.send(f'Map "{map_display_name}" has been added to the game.',
-                                            ephemeral=True)
-        await m.delete(delay=global_utils.delete_after_seconds)
+        self.request_sync()
+        await interaction.response.send_message(f'Map "{map_display_name}" has been added to the game.',
+                                                ephemeral=True, delete_after=global_utils.delete_after_seconds)
 
     @app_commands.command(name="remove-map", description=global_utils.commands["remove-map"]["description"])
     @app_commands.describe(
         map_name="The name of the map that was removed from the game"
     )
+    @app_commands.autocomplete(map_name=all_maps_autocomplete)
     @app_commands.choices(
-        map_name=[
-            app_commands.Choice(name=s.title(), value=s) for s in global_utils.map_preferences.keys()
-        ],
         confirm=[app_commands.Choice(
             name="WARNING: This will remove the map and all of its data from the game (weights, votes, etc.)", value=1)]
     )
@@ -160,7 +436,7 @@ class AdminPremierCommands(commands.Cog):
         # confirm is automatically chcecked by discord, so we just need to ensure it is a required argument to "confirm"
 
         map_name = map_name.lower()
-        map_display_name = global_utils.style_text(map_name.title(), 'i')
+        map_display_name = style_map_name(map_name)
 
         if map_name not in global_utils.map_preferences:
             await interaction.response.send_message(f'Map "{map_display_name}" is not in the game.',
@@ -168,38 +444,47 @@ class AdminPremierCommands(commands.Cog):
             return
 
         # if it's in the map pool, remove it
-        if map_name in global_utils.map_pool:
+        if map_name in global_utils.map_pool_set:
             global_utils.map_pool.remove(map_name)
-
-        async with asqlite.connect("./local_storage/maps.db") as conn:
-            async with conn.cursor() as cursor:
-                await cursor.execute("DELETE FROM info WHERE map = ?", (map_name,))
-                await cursor.execute("DELETE FROM notes WHERE map = ?", (map_name,))
-                await cursor.execute("PRAGMA table_info(preferences)")
-                cols = await cursor.fetchall()
-                cols = [c[1] for c in cols if c[1] != map_name]
-                new_cols = ' integer default NULL, '.join(cols) + ' integer default NULL'
-
-                await cursor.execute("BEGIN TRANSACTION")
-                await cursor.execute(f"CREATE TEMP TABLE temp_table({new_cols})")
-                await cursor.execute(f"INSERT INTO temp_table SELECT {', '.join(cols)} FROM preferences")
-                await cursor.execute("DROP TABLE preferences")
-
-                new_cols = f"user_id integer primary key, {' integer default NULL, '.join(cols)} integer default NULL"
-                await cursor.execute(f"CREATE TABLE preferences({new_cols})")
-                await cursor.execute("INSERT INTO preferences SELECT * FROM temp_table")
-                await cursor.execute("DROP TABLE temp_table")
-
-            await conn.commit()
+            global_utils.map_pool_set = frozenset(global_utils.map_pool)
+
+        async with self.db_lock:
+            async with self.db.cursor() as cursor:
+                # the whole removal is one transaction (and one write to disk)
+                await cursor.execute("BEGIN IMMEDIATE")
+                try:
+                    await cursor.execute("DELETE FROM info WHERE map = ?", (map_name,))
+                    await cursor.execute("DELETE FROM notes WHERE map = ?", (map_name,))
+
+                    if sqlite_drop_column:
+                        await cursor.execute(f"ALTER TABLE preferences DROP COLUMN {global_utils.quote_identifier(map_name)}")
+                    else:
+                        await cursor.execute("PRAGMA table_info(preferences)")
+                        cols = await cursor.fetchall()
+                        cols = [global_utils.quote_identifier(c[1]) for c in cols if c[1] not in ("user_id", map_name)]
+                        col_defs = ''.join(f", {c} integer default NULL" for c in cols)
+                        col_list = ', '.join(["user_id"] + cols)
+
+                        await cursor.execute(f"CREATE TEMP TABLE temp_table(user_id integer{col_defs})")
+                        # name the columns so the copies don't depend on column order
+                        await cursor.execute(f"INSERT INTO temp_table({col_list}) SELECT {col_list} FROM preferences")
+                        await cursor.execute("DROP TABLE preferences")
+                        await cursor.execute(f"CREATE TABLE preferences(user_id integer primary key{col_defs})")
+                        await cursor.execute(f"INSERT INTO preferences({col_list}) SELECT {col_list} FROM temp_table")
+                        await cursor.execute("DROP TABLE temp_table")
+                except Exception:
+                    await self.db.rollback()
+                    raise
+
+            await self.db.commit()
 
         global_utils.map_preferences.pop(map_name)
         global_utils.map_weights.pop(map_name)
         global_utils.map_image_urls.pop(map_name, None)
 
-        await interaction.response.defer()
-        await self.sync_map_pool()
-        await interaction.followup.send(f'Map "{map_display_name}" has been removed from the game.',
-                                        ephemeral=True)
+        self.request_sync()
+        await interaction.response.send_message(f'Map "{map_display_name}" has been removed from the game.',
+                                                ephemeral=True)
 
     async def convert_addevents_date(self, interaction: discord.Interaction, date: str) -> datetime | None:
         """Converts the date input for the /addevents command and 
@@ -217,9 +502,10 @@ class AdminPremierCommands(commands.Cog):
         datetime.datetime | None
             The converted date if valid, otherwise None
         """
-        regex = r"(0?[1-9]|1[0-2])/(0?[1-9]|[12][0-9]|3[01])/([0-9]{2})"
-        matches = match(regex, date)
-        if not matches or sum(len(g) for g in matches.groups()) != len(date) - 2:
+        try:
+            # %m and %d also accept months/days without leading 0s
+            input_date = global_utils.tz.localize(datetime.strptime(date.strip(), "%m/%d/%y"))
+        except ValueError:
             example = f"(ex. {global_utils.style_text('07/10/24 or 7/10/24', 'c')} for July 10th, 2024)"
             format_hint = f"Please provide a date in the format {global_utils.style_text('mm/dd/yy', 'c')}. {example}"
             m = await interaction.followup.send(f'Invalid date format. {format_hint}',
@@ -227,16 +513,6 @@ class AdminPremierCommands(commands.Cog):
             await m.delete(delay=global_utils.delete_after_seconds)
             return None
 
-        month, day, year = (str(int(g)) for g in matches.groups())
-
-        if len(month) == 1:
-            month = "0" + month
-        if len(day) == 1:
-            day = "0" + day
-
-        input_date = global_utils.tz.localize(datetime.strptime(
-            f"{month}/{day}/{year}", "%m/%d/%y"))  # - for no leading 0s
-
         if input_date.weekday() != 3:
             m = await interaction.followup.send('Input date is not a Thursday.',
                                                 ephemeral=True)
@@ -263,10 +539,11 @@ class AdminPremierCommands(commands.Cog):
         """
         # split by comma and remove extra whitespace
         new_maps = [m.strip().lower() for m in map_list.split(",")]
-        bad_maps = [m for m in new_maps if m not in global_utils.map_pool]
+        # each bad map only needs to be reported once
+        bad_maps = list(dict.fromkeys(m for m in new_maps if m not in global_utils.map_pool_set))
 
         if bad_maps:
-            bad_maps = [global_utils.style_text(m.title(), 'i') for m in bad_maps]
+            bad_maps = [style_map_name(m) for m in bad_maps]
             bad_maps = ", ".join(bad_maps)
             map_list = global_utils.style_text('map_list', 'c')
             map_pool = global_utils.style_text('/map-pool', 'c')
@@ -306,27 +583,37 @@ class AdminPremierCommands(commands.Cog):
         if not thur_time or not new_maps:
             return  # error message already sent
 
-        thur_time = thur_time.replace(hour=22, minute=0, second=0)
+        # work with the naive (wall clock) times and localize each event separately so the event times
+        # stay correct across DST changes (adding a timedelta to an aware datetime keeps its old UTC offset)
+        thur_time = thur_time.replace(hour=22, minute=0, second=0, tzinfo=None)
         sat_time = (thur_time + timedelta(days=2)).replace(hour=23)
         sun_time = thur_time + timedelta(days=3)
 
-        start_times = [global_utils.tz.localize(
-            d) for d in [thur_time, sat_time, sun_time]]
+        base_times = [thur_time, sat_time, sun_time]
 
         output = ""
 
-        now = global_utils.tz.localize(datetime.now())
+        now = datetime.now(global_utils.tz)
 
         if interaction.guild.id == global_utils.val_server_id:
             this_id = self.event_channel_id
         else:
             this_id = self.debug_event_channel_id
 
-        voice_channel = discord.utils.get(
-            guild.voice_channels, id=this_id)
+        voice_channel = guild.get_channel(this_id)
+
+        if voice_channel is None:
+            m = await interaction.followup.send('Could not find the premier voice channel for the events.',
+                                                ephemeral=True)
+            await m.delete(delay=global_utils.delete_after_seconds)
+            return
+
+        new_events = []
 
         for i, map_name in enumerate(new_maps):
-            for j, start_time in enumerate(start_times):
+            week_times = [global_utils.tz.localize(t + timedelta(weeks=i)) for t in base_times]
+
+            for j, start_time in enumerate(week_times):
                 if now > start_time:
                     output = "Detected that input date is in the past. Any maps that are in the past were skipped."
                     continue
@@ -334,31 +621,30 @@ class AdminPremierCommands(commands.Cog):
                 event_desc = map_name.title()
 
                 # last map and last day is playoffs
-                if i == len(new_maps) - 1 and j == len(start_times) - 1:
+                if i == len(new_maps) - 1 and j == len(week_times) - 1:
                     event_name = "Premier Playoffs"
                     event_desc = "Playoffs"
 
-                await guild.create_scheduled_event(name=event_name, description=event_desc, channel=voice_channel,
-                                                   start_time=start_time, end_time=start_time + timedelta(hours=1),
-                                                   entity_type=discord.EntityType.voice,
-                                                   privacy_level=discord.PrivacyLevel.guild_only)
+                new_events.append({"name": event_name, "description": event_desc, "channel": voice_channel,
+                                   "start_time": start_time, "end_time": start_time + timedelta(hours=1),
+                                   "entity_type": discord.EntityType.voice,
+                                   "privacy_level": discord.PrivacyLevel.guild_only})
 
-            start_times = [start_time + timedelta(days=7)
-                           for start_time in start_times]
+        failed = await self.create_events(guild, new_events)
 
-        new_maps = [global_utils.style_text(m, 'i')
-                    for m in ", ".join(new_maps)]
+        map_list = ", ".join(style_map_name(m) for m in new_maps)
         global_utils.log(
-            f'{interaction.user.display_name} has posted the premier schedule starting on {date} with maps: {new_maps}')
+            f'{interaction.user.display_name} has posted the premier schedule starting on {date} with maps: {map_list}')
 
-        output += f'\nThe Premier schedule has been created starting on {date} with maps: {", ".join(new_maps)}'
+        output += f'\nThe Premier schedule has been created starting on {date} with maps: {map_list}'
+        if failed:
+            output += f'\n{failed} of {len(new_events)} events could not be created. Check the schedule and add them manually'
         await interaction.followup.send(output, ephemeral=True)
         # don't delete the message. This command can take a while and the user may miss the notification
 
     @app_commands.command(name="cancel-event", description=global_utils.commands["cancel-event"]["description"])
+    @app_commands.autocomplete(map_name=event_maps_autocomplete)
     @app_commands.choices(
-        map_name=[app_commands.Choice(name=s.title(), value=s) for s in global_utils.map_pool] +
-        [app_commands.Choice(name="Playoffs", value="playoffs")],
         all_events=[
             app_commands.Choice(name="Yes", value=1),
         ],
@@ -388,11 +674,11 @@ class AdminPremierCommands(commands.Cog):
         announce : int, optional
             Treated as a boolean. Announce the cancellation when used in the premier channel, by default 0
         """
-        map_display_name = global_utils.style_text(map_name.title(), 'i')
+        map_name = map_name.lower()
+        map_display_name = style_map_name(map_name)
 
-        if map_name not in global_utils.map_pool and map_name != "playoffs":
-            hint = f"Ensure that {global_utils.style_text('/map-pool', 'c')} is updated."
-            await interaction.response.send_message(f'{map_display_name} is not in the map pool. {hint}',
+        if map_name not in global_utils.map_pool_set and map_name != "playoffs":
+            await interaction.response.send_message(f'{map_display_name} is not in the map pool. {map_pool_hint}',
                                                     ephemeral=True, delete_after=global_utils.delete_after_seconds)
             return
 
@@ -400,32 +686,36 @@ class AdminPremierCommands(commands.Cog):
         await interaction.response.defer(ephemeral=ephem, thinking=True)
 
         guild = interaction.guild
-        events = guild.scheduled_events
+
+        # filter the events once (map is already lower), closest first.
+        # the name is checked first so the description is only lowered for premier events (which may have none)
+        map_events = sorted((event for event in guild.scheduled_events
+                             if "Premier" in event.name and (event.description or "").lower() == map_name),
+                            key=lambda e: e.start_time)
 
         message = ""
 
-        for event in events:
-            if "Premier" in event.name and event.description.lower() == map_name:  # map is already lower
-                if event.status == discord.EventStatus.scheduled:
-                    await event.cancel()
-                elif event.status == discord.EventStatus.active:
-                    await event.end()
-                else:
-                    await event.delete()
-
-                if not all_events:
-                    e_name = event.name
-                    e_desc = event.description
-                    e_date = event.start_time
-                    display_date = global_utils.discord_local_time(
-                        e_date, with_date=True)
-                    log_date = event.start_time.astimezone(
-                        global_utils.tz).isoformat(sep=' ', timespec='seconds')
-                    message = f'{e_name} on {e_desc} on {display_date} has been cancelled'
-                    log_message = f'{e_name} on {e_desc} on {log_date} has been cancelled'
-                    break
-                else:
-                    message = log_message = f'All events on {map_display_name} have been cancelled'
+        if all_events:
+            failed = await self.end_events(map_events)
+
+            if map_events:
+                message = log_message = f'All events on {map_display_name} have been cancelled'
+                if failed:
+                    message = log_message = \
+                        f'{len(map_events) - failed} of {len(map_events)} events on {map_display_name} have been cancelled'
+        elif map_events:
+            event = map_events[0]
+            await end_event(event)
+
+            e_name = event.name
+            e_desc = event.description
+            e_date = event.start_time
+            display_date = global_utils.discord_local_time(
+                e_date, with_date=True)
+            log_date = event.start_time.astimezone(
+                global_utils.tz).isoformat(sep=' ', timespec='seconds')
+            message = f'{e_name} on {e_desc} on {display_date} has been cancelled'
+            log_message = f'{e_name} on {e_desc} on {log_date} has been cancelled'
 
         if message == "":
             message = f"No events found for {map_display_name} in the schedule."
@@ -457,46 +747,58 @@ class AdminPremierCommands(commands.Cog):
         guild = interaction.guild
         events = guild.scheduled_events
 
-        if len([event for event in events if event.name == "Premier" and event.description != "Playoffs"]) == 0:
+        if not any(event.name == "Premier" and event.description != "Playoffs" for event in events):
             hint = global_utils.style_text('/addevents', 'c')
             m = await interaction.followup.send(f'Please add the premier events first ({hint})', ephemeral=True)
             await m.delete(delay=global_utils.delete_after_seconds)
             return
 
-        wed_hour = global_utils.est_to_utc(time(hour=22)).hour
-        fri_hour = wed_hour + 1
+        new_practices = []
+        now = datetime.now(tz=utc)
 
         for event in events:
-            if event.start_time.astimezone(global_utils.tz).weekday() != 3 or "Premier" not in event.name:
+            if "Premier" not in event.name:
+                continue
+
+            # the Thursday check depends on the local date, so this conversion can't be skipped
+            thur_time = event.start_time.astimezone(global_utils.tz)
+            if thur_time.weekday() != 3:
                 continue
 
-            wed_time = fri_time = event.start_time.astimezone(utc)
-            wed_time = wed_time.replace(hour=wed_hour) - timedelta(days=1)
-            fri_time = fri_time.replace(hour=fri_hour) + timedelta(days=1)
+            # localize each day separately so the practice times stay correct across DST changes
+            thur_date = thur_time.date()
+            wed_time = global_utils.tz.localize(
+                datetime.combine(thur_date - timedelta(days=1), self.wed_practice_time))
+            fri_time = global_utils.tz.localize(
+                datetime.combine(thur_date + timedelta(days=1), self.fri_practice_time))
 
             for start_time in [wed_time, fri_time]:
-                if start_time < datetime.now().astimezone(utc):
+                if start_time < now:
                     continue
 
                 event_name = "Premier Practice"
                 event_desc = event.description
 
-                await guild.create_scheduled_event(name=event_name, description=event_desc, channel=event.channel,
-                                                   start_time=start_time, end_time=start_time + timedelta(hours=1),
-                                                   entity_type=discord.EntityType.voice,
-                                                   privacy_level=discord.PrivacyLevel.guild_only)
+                new_practices.append({"name": event_name, "description": event_desc, "channel": event.channel,
+                                      "start_time": start_time, "end_time": start_time + timedelta(hours=1),
+                                      "entity_type": discord.EntityType.voice,
+                                      "privacy_level": discord.PrivacyLevel.guild_only})
+
+        failed = await self.create_events(guild, new_practices)
 
         global_utils.log(
             f'{interaction.user.display_name} has posted the premier practice schedule')
 
-        m = await interaction.followup.send('Added premier practice events to the schedule', ephemeral=True)
+        message = 'Added premier practice events to the schedule'
+        if failed:
+            message += f'. {failed} of {len(new_practices)} practices could not be created'
+
+        m = await interaction.followup.send(message, ephemeral=True)
         await m.delete(delay=global_utils.delete_after_seconds)
 
     @app_commands.command(name="cancel-practice", description=global_utils.commands["cancel-practice"]["description"])
+    @app_commands.autocomplete(map_name=pool_maps_autocomplete)
     @app_commands.choices(
-        map_name=[
-            app_commands.Choice(name=s.title(), value=s) for s in global_utils.map_pool
-        ],
         all_practices=[
             app_commands.Choice(name="Yes", value=1),
         ],
@@ -525,11 +827,11 @@ class AdminPremierCommands(commands.Cog):
         announce : int, optional
             Treated as a boolean. Announce the cancellation when used in the premier channel, by default 0
         """
-        map_display_name = global_utils.style_text(map_name.title(), 'i')
+        map_name = map_name.lower()
+        map_display_name = style_map_name(map_name)
 
-        if map_name not in global_utils.map_pool:
-            hint = f"Ensure that {global_utils.style_text('/map-pool', 'c')} is updated."
-            await interaction.response.send_message(f"{map_display_name} is not in the map pool. {hint}",
+        if map_name not in global_utils.map_pool_set:
+            await interaction.response.send_message(f"{map_display_name} is not in the map pool. {map_pool_hint}",
                                                     ephemeral=True, delete_after=global_utils.delete_after_seconds)
             return
 
@@ -537,26 +839,28 @@ class AdminPremierCommands(commands.Cog):
         await interaction.response.defer(ephemeral=ephem, thinking=True)
 
         guild = interaction.guild
-        events = guild.scheduled_events
+
+        # filter the events once, closest first
+        map_practices = sorted((event for event in guild.scheduled_events
+                                if event.name == "Premier Practice" and (event.description or "").lower() == map_name),
+                               key=lambda e: e.start_time)
 
         message = f"No practices found for {map_display_name} in the schedule."
 
-        for event in events:
-            if event.name == "Premier Practice" and event.description.lower() == map_name:
-                if event.status == discord.EventStatus.scheduled:
-                    await event.cancel()
-                elif event.status == discord.EventStatus.active:
-                    await event.end()
-                else:
-                    await event.delete()
-
-                if not all_practices:
-                    e_name = event.name
-                    e_date = event.start_time.date()
-                    message = f'{e_name} on {map_display_name} for {e_date} has been cancelled'
-                    break
-                else:
-                    message = f'All practices on {map_display_name} have been cancelled'
+        if all_practices:
+            failed = await self.end_events(map_practices)
+
+            if map_practices:
+                message = f'All practices on {map_display_name} have been cancelled'
+                if failed:
+                    message = f'{len(map_practices) - failed} of {len(map_practices)} practices on {map_display_name} have been cancelled'
+        elif map_practices:
+            event = map_practices[0]
+            await end_event(event)
+
+            e_name = event.name
+            e_date = event.start_time.date()
+            message = f'{e_name} on {map_display_name} for {e_date} has been cancelled'
 
         if message != f"No practices found for {map_display_name} in the schedule.":
             global_utils.log(
@@ -605,27 +909,21 @@ class AdminPremierCommands(commands.Cog):
         guild = interaction.guild
         events = guild.scheduled_events
 
-        for event in events:
-            if "Premier" in event.name:
-                if event.status == discord.EventStatus.scheduled:
-                    await event.cancel()
-                elif event.status == discord.EventStatus.active:
-                    await event.end()
-                else:
-                    await event.delete()
+        premier_events = [event for event in events if "Premier" in event.name]
+        failed = await self.end_events(premier_events)
 
         global_utils.log(
             f'{interaction.user.display_name} has cleared the premier schedule')
 
-        await interaction.followup.send('Cleared the premier schedule', ephemeral=ephem)
+        message = 'Cleared the premier schedule'
+        if failed:
+            message = f'Cleared {len(premier_events) - failed} of {len(premier_events)} events from the premier schedule'
+
+        await interaction.followup.send(message, ephemeral=ephem)
         # don't delete the message. This command can take a while and the user may miss the notification
 
     @app_commands.command(name="add-note", description=global_utils.commands["add-note"]["description"])
-    @app_commands.choices(
-        map_name=[
-            app_commands.Choice(name=s.title(), value=s) for s in global_utils.map_preferences.keys()
-        ]
-    )
+    @app_commands.autocomplete(map_name=all_maps_autocomplete)
     @app_commands.describe(
         map_name="The map to add a note for",
         note_id="The message ID of the note to add a reference to",
@@ -645,6 +943,13 @@ class AdminPremierCommands(commands.Cog):
         description : str
             The description of the note. Used to easily identify this note when using /notes
         """
+        map_name = map_name.lower()
+
+        if map_name not in global_utils.map_preferences:
+            await interaction.response.send_message(f'Map "{style_map_name(map_name)}" is not in the game.',
+                                                    ephemeral=True, delete_after=global_utils.delete_after_seconds)
+            return
+
         note_id = int(note_id)
         try:
             message = interaction.channel.get_partial_message(note_id)
@@ -658,20 +963,17 @@ class AdminPremierCommands(commands.Cog):
                                                     ephemeral=True, delete_after=global_utils.delete_after_seconds)
             return
 
-        if map_name not in global_utils.practice_notes:
-            global_utils.practice_notes[map_name] = {}
+        global_utils.practice_notes.setdefault(map_name, {})[note_id] = description
 
-        global_utils.practice_notes[map_name][note_id] = description
-
-        async with asqlite.connect("./local_storage/maps.db") as conn:
-            async with conn.cursor() as cursor:
+        async with self.db_lock:
+            async with self.db.cursor() as cursor:
                 await cursor.execute("INSERT INTO notes VALUES (?, ?, ?)", (note_id, map_name, description))
-            await conn.commit()
+            await self.db.commit()
 
         global_utils.log(
             f'{interaction.user.display_name} has added a practice note. Note ID: {note_id}')
 
-        display_map_name = global_utils.style_text(map_name.title(), 'i')
+        display_map_name = style_map_name(map_name)
         access_command = global_utils.style_text(
             f'/notes {map_name.title()}', 'c')
 
@@ -679,11 +981,7 @@ class AdminPremierCommands(commands.Cog):
                                                 ephemeral=True, delete_after=global_utils.delete_after_seconds)
 
     @app_commands.command(name="remove-note", description=global_utils.commands["remove-note"]["description"])
-    @app_commands.choices(
-        map_name=[
-            app_commands.Choice(name=s.title(), value=s) for s in global_utils.map_preferences.keys()
-        ]
-    )
+    @app_commands.autocomplete(map_name=all_maps_autocomplete)
     @app_commands.describe(
         map_name="The map to remove the note reference from",
         note_number="The note number to remove (1-indexed). Leave empty to see options."
@@ -701,43 +999,45 @@ class AdminPremierCommands(commands.Cog):
         note_number : int, optional
             The note number to remove (1-indexed). Leave empty/0 to see options, by default 0
         """
-        map_display_name = global_utils.style_text(map_name.title(), 'i')
+        map_name = map_name.lower()
+        map_display_name = style_map_name(map_name)
+
+        num_notes = len(global_utils.practice_notes.get(map_name, {}))
 
-        if map_name not in global_utils.practice_notes or len(global_utils.practice_notes[map_name]) == 0:
+        if num_notes == 0:
             await interaction.response.send_message(f'No notes found for {map_display_name}',
                                                     ephemeral=True, delete_after=global_utils.delete_after_seconds)
             return
 
-        if note_number not in range(len(global_utils.practice_notes[map_name]) + 1):
+        if not 0 <= note_number <= num_notes:
             await interaction.response.send_message('Invalid note number. Leave blank to see all options.',
                                                     ephemeral=True, delete_after=global_utils.delete_after_seconds)
             return
 
         if note_number == 0:
             notes_list = global_utils.practice_notes[map_name]
-            output = global_utils.style_text("Practice notes for ", 'b')
-            output += global_utils.style_text(map_display_name, 'b') + ":\n"
-            for i, note_id in enumerate(notes_list.keys()):
-                note_number = f"Note {i+1}"
-                note_number = global_utils.style_text(note_number, 'b')
-
-                output += f"- {note_number}: {global_utils.style_text(notes_list[note_id], 'i')}\n"
+            header = (global_utils.style_text("Practice notes for ", 'b') +
+                      global_utils.style_text(map_display_name, 'b') + ":")
+            lines = [header] + [
+                f"- {global_utils.style_text(f'Note {i}', 'b')}: {global_utils.style_text(description, 'i')}"
+                for i, description in enumerate(notes_list.values(), start=1)
+            ]
+            output = "\n".join(lines) + "\n"
 
             await interaction.response.send_message(output,
                                                     ephemeral=True, delete_after=global_utils.delete_after_seconds)
             return
 
-        note_id = list(global_utils.practice_notes[map_name].keys())[
-            note_number - 1]
+        note_id = next(islice(global_utils.practice_notes[map_name], note_number - 1, None))
         global_utils.practice_notes[map_name].pop(note_id)
 
         await interaction.response.send_message(f"Removed a practice note for {map_display_name}",
                                                 ephemeral=True, delete_after=global_utils.delete_after_seconds)
 
-        async with asqlite.connect("./local_storage/maps.db") as conn:
-            async with conn.cursor() as cursor:
+        async with self.db_lock:
+            async with self.db.cursor() as cursor:
                 await cursor.execute("DELETE FROM notes WHERE note_id = ?", (note_id,))
-            await conn.commit()
+            await self.db.commit()
 
         global_utils.log(
             f'{interaction.user.display_name} has removed a practice note. Note ID: {note_id}')
@@ -751,7 +1051,7 @@ class MapPoolPanel(discord.ui.View):
     timeout : float | None, optional
         The timeout for the panel, by default None
     sync_changes : callable
-        The function to call to sync the changes made in the panel to discord
+        The function to call to sync the changes made in the panel to discord (after they are saved).
         This updates things like app_command choices.
     """
     # pylint: disable=unused-argument
@@ -759,7 +1059,8 @@ class MapPoolPanel(discord.ui.View):
     def __init__(self, *, timeout: float | None = None, sync_changes: callable) -> None:
         super().__init__(timeout=timeout)
         self.sync = sync_changes
-        self.pool = global_utils.map_pool
+        # work on a copy so the global pool is only changed when the changes are applied
+        self.pool = set(global_utils.map_pool)
         self.select = self.children[0]
 
     async def disable(self, interaction: discord.Interaction) -> None:
@@ -785,8 +1086,6 @@ class MapPoolPanel(discord.ui.View):
         interaction : discord.Interaction
             The interaction object linked to the panel
         """
-        self.pool.sort()
-
         for option in self.select.options:
             option.default = option.value in self.pool
 
@@ -808,7 +1107,7 @@ class MapPoolPanel(discord.ui.View):
         select : discord.ui.Select
             The select object that was interacted with
         """
-        self.pool = sorted(self.select.values)
+        self.pool = set(self.select.values)
         await self.resend(interaction)
 
     @discord.ui.button(custom_id="apply_changes", label="Apply Changes", row=1,
@@ -825,15 +1124,20 @@ class MapPoolPanel(discord.ui.View):
         """
         await interaction.response.edit_message(content="Changes applied", view=None)
 
+        if self.pool == global_utils.map_pool_set:
+            return  # nothing to save or sync
+
         async with asqlite.connect("./local_storage/maps.db") as conn:
             async with conn.cursor() as cursor:
                 await cursor.execute("BEGIN TRANSACTION")
-                for m in global_utils.map_preferences:
-                    await cursor.execute("UPDATE info SET in_pool = ? WHERE map = ?", (m in self.pool, m))
+                # one round trip to the database thread instead of one per map
+                await cursor.executemany("UPDATE info SET in_pool = ? WHERE map = ?",
+                                         [(m in self.pool, m) for m in global_utils.map_preferences])
             await conn.commit()
 
-        global_utils.map_pool = self.pool
-        await self.sync(interaction.guild.id)
+        global_utils.map_pool = sorted(self.pool)
+        global_utils.map_pool_set = frozenset(self.pool)
+        self.sync()
 
     @discord.ui.button(custom_id="clear_map_pool", label="Clear", row=1,
                        style=discord.ButtonStyle.danger, emoji="🗑️")
@@ -847,6 +1151,10 @@ class MapPoolPanel(discord.ui.View):
         button : discord.ui.Button
             The button that was clicked
         """
+        if not self.pool:
+            await interaction.response.defer()  # already clear, no need to edit the panel
+            return
+
         self.pool.clear()
         await self.resend(interaction)
 
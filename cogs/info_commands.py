@@ -1,6 +1,9 @@
 """[cog] A cog for displaying general premier information
 (that isn'tW provided by persist_commands.py).
 """
+import asyncio
+from itertools import islice
+
 import asqlite
 
 import discord
@@ -10,6 +13,9 @@ from discord import app_commands
 
 from global_utils import global_utils
 
+# how each map preference (vote) is displayed
+preference_decoder = {-1: "👎", 0: "🤷‍♀️", 1: "👍"}
+
 
 class InfoCommands(commands.Cog):
     """[cog] A cog for displaying general premier information 
@@ -25,6 +31,76 @@ class InfoCommands(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
 
+        # one connection to the maps database for the cog's lifetime (opened in cog_load)
+        self.db: asqlite.Connection | None = None
+        self.db_lock = asyncio.Lock()
+
+        # guild id -> premier role id. Evicted when a role in the guild changes
+        self.role_id_cache: dict[int, int] = {}
+
+    async def cog_load(self) -> None:
+        """[event] Opens the cog's database connection when the cog is loaded
+        """
+        self.db = await asqlite.connect("./local_storage/maps.db")
+        await global_utils.tune_db_connection(self.db)
+
+    async def cog_unload(self) -> None:
+        """[event] Closes the cog's database connection when the cog is unloaded
+        """
+        # wait for any command still using the connection
+        async with self.db_lock:
+            if self.db is not None:
+                await self.db.close()
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role) -> None:  # pylint: disable=unused-argument
+        """[event] Executes when a role is updated. Clears the cached premier role for the guild
+
+        Parameters
+        ----------
+        before : discord.Role
+            The role before the update
+        after : discord.Role
+            The role after the update
+        """
+        self.role_id_cache.pop(after.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role) -> None:
+        """[event] Executes when a role is deleted. Clears the cached premier role for the guild
+
+        Parameters
+        ----------
+        role : discord.Role
+            The role that was deleted
+        """
+        self.role_id_cache.pop(role.guild.id, None)
+
+    def get_premier_role(self, guild: discord.Guild) -> discord.Role | None:
+        """[helper] Gets the premier role for a guild, only searching the guild's roles by name the first time
+
+        Parameters
+        ----------
+        guild : discord.Guild
+            The guild to get the premier role for
+
+        Returns
+        -------
+        discord.Role | None
+            The premier role, if the guild has one
+        """
+        if guild.id in self.role_id_cache:
+            return guild.get_role(self.role_id_cache[guild.id])
+
+        is_prem = guild.id == global_utils.val_server_id
+        role_name = global_utils.prem_role_name if is_prem else global_utils.debug_role_name
+        role = discord.utils.get(guild.roles, name=role_name)
+
+        if role is not None:
+            self.role_id_cache[guild.id] = role.id
+
+        return role
+
     @app_commands.command(name="map-weights", description=global_utils.commands["map-weights"]["description"])
     @app_commands.choices(
         announce=[
@@ -46,18 +122,23 @@ class InfoCommands(commands.Cog):
         """
         ephem = interaction.channel.id != global_utils.prem_channel_id or not announce
 
-        output = ""
+        pool_maps = [m for m in global_utils.map_weights if m in global_utils.map_pool_set]
+
+        if not pool_maps:
+            await interaction.response.send_message("No weights to show for maps in the map pool.", ephemeral=ephem)
+            return
 
-        for map_name in [m for m in global_utils.map_weights if m in global_utils.map_pool]:
+        lines = []
+
+        for map_name in pool_maps:
 
             map_display_name = global_utils.style_text(map_name.title(), 'i')
             weight = global_utils.style_text(
                 global_utils.map_weights[map_name], 'b')
 
-            output += f'- {map_display_name}: {weight}\n'
+            lines.append(f'- {map_display_name}: {weight}\n')
 
-        if output == "":
-            output = "No weights to show for maps in the map pool."
+        output = "".join(lines)
 
         await interaction.response.send_message(output, ephemeral=ephem)
 
@@ -82,39 +163,37 @@ class InfoCommands(commands.Cog):
         """
         ephem = interaction.channel.id != global_utils.prem_channel_id or not announce
 
-        is_prem = interaction.guild.id == global_utils.val_server_id
+        # map_weights is sorted by weight already,
+        pool_maps = [m for m in global_utils.map_weights if m in global_utils.map_pool_set]
 
-        role_name = global_utils.prem_role_name if is_prem else global_utils.debug_role_name
-        premier_team = discord.utils.get(
-            interaction.guild.roles, name=role_name).members
+        if not pool_maps:
+            await interaction.response.send_message("No votes for any maps in the map pool.",
+                                                    ephemeral=ephem, silent=True)
+            return
 
-        output = ""
+        premier_team = self.get_premier_role(interaction.guild).members
+        team_by_id = {user.id: user for user in premier_team}
 
-        # map_weights is sorted by weight already,
-        for map_name in [m for m in global_utils.map_weights if m in global_utils.map_pool]:
-            header = (f"- {global_utils.style_text(map_name.title(), 'i')}" +
-                      f" ({global_utils.style_text(global_utils.map_weights[map_name], 'b')}):\n")
-            body = ""
+        lines = []
 
-            for user in premier_team:
-                if user.id not in global_utils.map_preferences[map_name]:
-                    continue
-
-                user_weight = global_utils.map_preferences[map_name][user.id]
+        for map_name in pool_maps:
+            lines.append(f"- {global_utils.style_text(map_name.title(), 'i')}" +
+                         f" ({global_utils.style_text(global_utils.map_weights[map_name], 'b')}):\n")
+            votes = []
 
-                preference_decoder = {-1: "👎", 0: "🤷‍♀️", 1: "👍"}
+            # only visit the users that voted on this map
+            for user_id, user_weight in global_utils.map_preferences[map_name].items():
+                user = team_by_id.get(user_id)
+                if user is None:
+                    continue
 
                 user_preference = preference_decoder.get(user_weight, "Preference Error")
 
-                body += f" - {user.mention}: {global_utils.style_text(user_preference, 'c')}\n"
-
-            if body == "":
-                body = " - No votes for this map.\n"
+                votes.append(f" - {user.mention}: {global_utils.style_text(user_preference, 'c')}\n")
 
-            output += header + body
+            lines.extend(votes or [" - No votes for this map.\n"])
 
-        if output == "":
-            output = "No votes for any maps in the map pool."
+        output = "".join(lines)
 
         await interaction.response.send_message(output, ephemeral=ephem, silent=True)
 
@@ -163,27 +242,26 @@ class InfoCommands(commands.Cog):
 
         if note_number == 0:
             notes_list = global_utils.practice_notes[map_name]
-            output = f"{global_utils.style_text('Practice notes', 'b')} for {map_display_name}:\n"
-            for i, note_id in enumerate(notes_list.keys()):
-                note_number = f"Note {i+1}"
-                note_number = global_utils.style_text(note_number, 'b')
-                output += f"- {note_number}: {global_utils.style_text(notes_list[note_id], 'i')}\n"
+            lines = [f"{global_utils.style_text('Practice notes', 'b')} for {map_display_name}:"] + [
+                f"- {global_utils.style_text(f'Note {i}', 'b')}: {global_utils.style_text(description, 'i')}"
+                for i, description in enumerate(notes_list.values(), start=1)
+            ]
+            output = "\n".join(lines) + "\n"
 
             await interaction.response.send_message(output, ephemeral=True)
             return
 
         await interaction.response.defer(ephemeral=ephem)
 
-        note_id = list(global_utils.practice_notes[map_name].keys())[
-            note_number - 1]
+        note_id = next(islice(global_utils.practice_notes[map_name], note_number - 1, None))
         try:
             note = await interaction.channel.fetch_message(int(note_id))
         except errors.NotFound:
             global_utils.practice_notes[map_name].pop(note_id)
-            async with asqlite.connect("./local_storage/maps.db") as conn:
-                async with conn.cursor() as cursor:
+            async with self.db_lock:
+                async with self.db.cursor() as cursor:
                     await cursor.execute("DELETE FROM notes WHERE note_id = ?", (note_id,))
-                await conn.commit()
+                await self.db.commit()
             m = await interaction.followup.send('The original message has been deleted. Removing it from the list.',
                                                 ephemeral=True)
             await m.delete(delay=global_utils.delete_after_seconds)
@@ -17,6 +17,8 @@ class MiscCommands(commands.Cog):
 
     def __init__(self, bot: commands.bot) -> None:
         self.bot = bot
+        # the custom emojis only change when the cogs are reloaded, so the /emojis text is built once
+        self.emojis_description: str | None = None
 
     @app_commands.command(name="hello", description=global_utils.commands["hello"]["description"])
     async def hello(self, interaction: Interaction) -> None:
@@ -39,14 +41,17 @@ class MiscCommands(commands.Cog):
         interaction : discord.Interaction
             The interaction object that initiated the command
         """
-        style = global_utils.style_text
-        emojis = global_utils.custom_emojis
-        hint = "To use an emoji, simply put the name of the emoji between 2 semicolons in any message."
-        hint = hint + f"Example: {style(';mc_pig;', 'c')} for the pig emoji"
+        if self.emojis_description is None:
+            style = global_utils.style_text
+            emojis = global_utils.custom_emojis
+            hint = "To use an emoji, simply put the name of the emoji between 2 semicolons in any message."
+            hint = hint + f"Example: {style(';mc_pig;', 'c')} for the pig emoji"
 
-        emoji_list = "- " + "\n- ".join([f"{style(name, 'b')}: {data['format']}" for name, data in emojis.items()])
+            emoji_list = "- " + "\n- ".join([f"{style(name, 'b')}: {data['format']}" for name, data in emojis.items()])
 
-        embed = Embed(title="Custom Emojis", description=f"{hint}\n{emoji_list}")
+            self.emojis_description = f"{hint}\n{emoji_list}"
+
+        embed = Embed(title="Custom Emojis", description=self.emojis_description)
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
 
@@ -249,15 +249,17 @@ class PersistentView(discord.ui.View):
 
         await interaction.response.defer(ephemeral=True, thinking=True)
 
-        output = ""
+        lines = []
 
         # don't just iterate over the map pool, the weights are sorted by weight and pool is not.
-        for map_name in [m for m in global_utils.map_weights if m in global_utils.map_pool]:
+        for map_name in [m for m in global_utils.map_weights if m in global_utils.map_pool_set]:
             map_display_name = global_utils.style_text(map_name.title(), 'i')
             weight = global_utils.style_text(
                 global_utils.map_weights[map_name], 'b')
 
-            output += f'- {map_display_name}: {weight}\n'
+            lines.append(f'- {map_display_name}: {weight}\n')
+
+        output = "".join(lines)
 
         if output == "":
             output = "No weights to show for maps in the map pool."
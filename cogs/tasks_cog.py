@@ -1,7 +1,6 @@
 """[cog] A cog for tasks that the bot needs to do on a regular basis
 (like sending reminders for upcoming events, clearing old reminders, etc.)
 """
-import sys
 from datetime import datetime, time, timedelta
 import asyncpg
 import pytz
@@ -287,13 +286,7 @@ class TasksCog(commands.Cog):
 
         if new_date != global_utils.log_date:
             global_utils.log("Starting new log file")
-            global_utils.log_date = new_date
-            global_utils.log_filepath = f"./logs/{global_utils.log_date}_stdout.log"
-            sys.stdout.close()
-            sys.stderr.close()
-
-            sys.stdout = open(global_utils.log_filepath, 'a', encoding="utf-8")
-            sys.stderr = open(f"./logs/{global_utils.log_date}_stderr.log", 'a', encoding="utf-8")
+            global_utils.new_log_files(new_date)
 
 
 async def setup(bot: commands.bot) -> None:
@@ -8,9 +8,13 @@ global_utils
 """
 # pylint: disable=wrong-import-order
 import os
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from queue import Queue
+from functools import lru_cache
 from datetime import datetime, time, timedelta
 import pytz
-from asyncio import run
+from asyncio import run, gather
 import re
 
 # reduce bloat, only for type hints
@@ -34,6 +38,7 @@ class Utils:
 
         self.log_date = datetime.now().strftime("%Y-%m-%d")
         self.log_filepath = f'./logs/{self.log_date}_stdout.log'
+        self.logger, self.log_listener = self.setup_logging()
 
         self.debug_server_id = 1217649405759324232
         self.debug_role_name = "southern"
@@ -46,10 +51,13 @@ class Utils:
         self.prem_channel_id = 1193661647752003614
         self.notes_channel_id = 1237971459461218376
 
+        # messages are only emojified in these servers (not in DMs or any other server)
+        self.emojify_guild_ids = frozenset([self.val_server_id, self.debug_server_id])
+
         self.my_id = 461265370813038633
         sam_id = 180107711806046208
-        self.admin_ids = [self.my_id, sam_id]
-        self.teammate_ids = []
+        self.admin_ids = frozenset([self.my_id, sam_id])
+        self.teammate_ids = frozenset()
 
         # delete messages after n seconds.
         # When using delete_after argument, the message will not be deleted if
@@ -77,6 +85,13 @@ class Utils:
 
         self.commands = run(self.get_commands())
         self.custom_emojis = run(self.get_custom_emojis())
+        # flattened views of custom_emojis for the emojify hot path
+        self.emoji_formats = {name: data["format"] for name, data in self.custom_emojis.items()}
+        self.emoji_links = {name: data["link"] for name, data in self.custom_emojis.items()}
+        self.emoji_regex = re.compile(";([A-Za-z_]+);")
+
+        # markdown markers used by style_text
+        self.text_styles = {'i': '_', 'u': '__', 'b': '**', 'c': '`'}
 
         map_info = run(self.get_map_info())
 
@@ -85,6 +100,7 @@ class Utils:
         self.map_preferences = {m: self.map_preferences[m] for m in self.map_weights}
 
         self.map_pool = sorted([m for m in map_info if map_info[m]["in_pool"]])
+        self.map_pool_set = frozenset(self.map_pool)  # for membership checks. Update it whenever map_pool changes
         self.map_image_urls = {m: map_info[m]["url"] for m in self.map_preferences}
 
         self.practice_notes = run(self.get_map_notes())
@@ -138,7 +154,7 @@ class Utils:
                     if c[1] == "user_id":
                         continue
 
-                    await cur.execute(f"SELECT user_id, {c[1]} FROM preferences")
+                    await cur.execute(f"SELECT user_id, {self.quote_identifier(c[1])} FROM preferences")
                     rows = await cur.fetchall()
 
                     ret.update({c[1]: {row[0]: row[1] for row in rows}})
@@ -195,6 +211,94 @@ class Utils:
 
         return ret
 
+    async def tune_db_connection(self, conn: asqlite.Connection) -> None:
+        """Applies the performance PRAGMAs to a long-lived database connection.
+        WAL mode is saved in the database file, the rest only apply to this connection
+
+        Parameters
+        ----------
+        conn : asqlite.Connection
+            The connection to tune
+        """
+        async with conn.cursor() as cur:
+            await cur.execute("PRAGMA journal_mode=WAL")
+            await cur.execute("PRAGMA synchronous=NORMAL")  # safe with WAL, only syncs at checkpoints
+            await cur.execute("PRAGMA temp_store=MEMORY")
+            await cur.execute("PRAGMA busy_timeout=30000")
+
+    def quote_identifier(self, name: str) -> str:
+        """Quotes a name (such as a map column) so it can be safely used as an SQL identifier
+
+        Parameters
+        ----------
+        name : str
+            The name to quote
+
+        Returns
+        -------
+        str
+            The quoted name
+        """
+        return '"' + name.replace('"', '""') + '"'
+
+    def setup_logging(self) -> tuple[logging.Logger, QueueListener]:
+        """Sets up logging through a queue so that the event loop never waits on the log files.
+        Bot logs go to the stdout log, debug logs go to the debug log, and anything else
+        (ex. discord.py warnings and errors) goes to the stderr log.
+
+        Returns
+        -------
+        tuple[logging.Logger, logging.handlers.QueueListener]
+            The bot's logger and the (not yet started) listener that writes the queued logs to the files
+        """
+        log_queue = Queue(-1)
+        date_format = "%Y-%m-%d %H:%M:%S"
+
+        self.stdout_handler = logging.StreamHandler(open(self.log_filepath, 'a', encoding="utf-8"))
+        self.stdout_handler.addFilter(lambda r: r.name == "bot" and r.levelno == logging.INFO)
+        self.stdout_handler.setFormatter(logging.Formatter("[%(asctime)s] %(message)s", date_format))
+
+        self.stderr_handler = logging.StreamHandler(
+            open(f'./logs/{self.log_date}_stderr.log', 'a', encoding="utf-8"))
+        self.stderr_handler.addFilter(lambda r: r.name != "bot")
+        self.stderr_handler.setFormatter(
+            logging.Formatter("[%(asctime)s] %(levelname)s %(name)s: %(message)s", date_format))
+
+        debug_handler = logging.FileHandler("./local_storage/debug_log.txt", encoding="utf-8")
+        debug_handler.addFilter(lambda r: r.name == "bot" and r.levelno == logging.DEBUG)
+        debug_handler.setFormatter(logging.Formatter("[%(asctime)s] %(message)s", date_format))
+
+        logger = logging.getLogger("bot")
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        logger.addHandler(QueueHandler(log_queue))
+
+        # discord.py (and asyncio) log through the root logger
+        logging.getLogger().addHandler(QueueHandler(log_queue))
+
+        listener = QueueListener(log_queue, self.stdout_handler, self.stderr_handler, debug_handler)
+
+        return logger, listener
+
+    def new_log_files(self, log_date: str) -> None:
+        """Switches the stdout and stderr logs over to the log files for a new date
+
+        Parameters
+        ----------
+        log_date : str
+            The date (YYYY-MM-DD) of the new log files
+        """
+        self.log_date = log_date
+        self.log_filepath = f'./logs/{self.log_date}_stdout.log'
+
+        new_streams = {self.stdout_handler: self.log_filepath,
+                       self.stderr_handler: f'./logs/{self.log_date}_stderr.log'}
+
+        for handler, filepath in new_streams.items():
+            old_stream = handler.setStream(open(filepath, 'a', encoding="utf-8"))
+            if old_stream is not None:
+                old_stream.close()
+
     def log(self, message: str) -> None:
         """Logs a message to the current stdout log file
 
@@ -203,13 +307,10 @@ class Utils:
         message : str
             The message to log
         """
-        with open(self.log_filepath, 'a+', encoding="utf-8") as file:
-            if "connected to Discord" in message:
-                prefix = "\n" if file.readline() != "" else ""
-                file.write(f"{prefix}{'-' * 50}\n")
+        if "connected to Discord" in message:
+            self.logger.info('-' * 50)
 
-            file.write(
-                f'[{datetime.now().strftime("%Y-%m-%d %H:%M:%S")}] {message}\n')
+        self.logger.info(message)
 
     def debug_log(self, message: str) -> None:
         """Logs a message to the debug log file
@@ -219,9 +320,7 @@ class Utils:
         message : str
             The debug message to log
         """
-        with open("./local_storage/debug_log.txt", 'a', encoding="utf-8") as file:
-            file.write(
-                f'[{datetime.now().strftime("%Y-%m-%d %H:%M:%S")}] {message}\n')
+        self.logger.debug(message)
 
     def est_to_utc(self, t: time) -> time:
         """Converts an EST time to a UTC time
@@ -262,6 +361,8 @@ class Utils:
         formatted = f"<t:{str(int(epoch_time))}:{style}>"
         return formatted
 
+    # the same map names and labels are styled over and over, so keep the recent results
+    @lru_cache(maxsize=512)
     def style_text(self, text: str, style: str) -> str:
         """Formats text to a specified style in Discord
 
@@ -290,13 +391,11 @@ class Utils:
 
         output = text
 
-        all_styles = {'i': '_', 'u': '__', 'b': '**', 'c': '`'}
-
         for s in style:
-            if s not in all_styles:
+            if s not in self.text_styles:
                 continue
 
-            s = all_styles[s]
+            s = self.text_styles[s]
             output = f"{s}{output}{s}"
 
         return output
@@ -342,13 +441,17 @@ class Utils:
             return {"output": text, "emojis": []}
 
         inserted_emojis = []
-        matches = re.findall(";([A-Za-z_]+);", text)
-        for match in matches:
-            if match in self.custom_emojis:
-                text = text.replace(f";{match};", self.custom_emojis[match]["format"])
-                inserted_emojis.append(match)
 
-        text = "".join(text)
+        def replace(match: re.Match) -> str:
+            name = match.group(1)
+            if name not in self.emoji_formats:
+                return match.group(0)
+
+            inserted_emojis.append(name)
+            return self.emoji_formats[name]
+
+        # single pass over the text instead of a str.replace per emoji found
+        text = self.emoji_regex.sub(replace, text)
 
         return {"output": text, "emojis": inserted_emojis}
 
@@ -360,16 +463,26 @@ class Utils:
         bot : discord.ext.commands.Bot
             The bot object that the cogs will be loaded into
         """
+        async def load(extension: str) -> None:
+            try:
+                # reload them if they're already loaded
+                await bot.reload_extension(extension)
+            except commands.ExtensionNotLoaded:  # otherwise
+                await bot.load_extension(extension)  # load them
+
         dirs = ["cogs", "ignore_but_use"]
-        for d in dirs:
-            for file in os.listdir(f'./{d}'):
-                if file.endswith('.py'):
-                    f = f'{d}.{file[:-3]}'
-                    try:
-                        # reload them if they're already loaded
-                        await bot.reload_extension(f)
-                    except commands.ExtensionNotLoaded:  # otherwise
-                        await bot.load_extension(f)  # load them
+        extensions = [f'{d}.{file[:-3]}' for d in dirs for file in os.listdir(f'./{d}') if file.endswith('.py')]
+
+        # the cogs don't depend on each other, so they can all be loaded at once
+        results = await gather(*(load(e) for e in extensions), return_exceptions=True)
+        errors = [r for r in results if isinstance(r, Exception)]
+
+        for extension, result in zip(extensions, results):
+            if isinstance(result, Exception):
+                self.log(f"Failed to load {extension}: {result}")
+
+        if errors:
+            raise errors[0]
 
     def already_logged(self, log_message: str) -> bool:
         """Checks if a log message has already been logged in the current stdout log file.